@@ -1,8 +1,11 @@
+import argparse
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv
 import json
 import ast
-import re
 from pathlib import Path
 
 
@@ -37,6 +40,12 @@ def safe_eval(value):
         if value == "" or value.lower() == "nan":
             return []
 
+        try:
+            # JSON-encoded lists parse much faster than literal_eval
+            return json.loads(value)
+        except ValueError:
+            pass
+
         try:
             # Convert strings like "['a','b']" → list
             return ast.literal_eval(value)
@@ -46,53 +55,86 @@ def safe_eval(value):
     return []
 
 
+def parse_list_column(series):
+    """Parse a list-like column with safe_eval.
+
+    read_json already yields real lists, so in that case only the missing
+    values are touched instead of walking every row. Typed Arrow list columns
+    (read from Parquet) need no parsing, only a single to_pylist pass —
+    pandas 2.1 can't read its own list<...>[pyarrow] dtype back from Parquet.
+    """
+    if isinstance(series.dtype, pd.ArrowDtype):
+        series = pd.Series(pa.array(series).to_pylist(), index=series.index, dtype=object)
+
+    present = series.dropna()
+    if len(present) and isinstance(present.iloc[0], (list, dict)):
+        missing = series.isna()
+        if missing.any():
+            series = series.copy()
+            series[missing] = series[missing].map(safe_eval)
+        return series
+
+    return series.map(safe_eval)
+
+
 # -----------------------------------------
 # TEXT NORMALIZER
 # -----------------------------------------
-def normalize_text(text):
-    if not isinstance(text, str):
-        return ""
-
-    text = text.lower()
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+def normalize_text(series):
+    """Lowercase + collapse whitespace for a whole column; missing → ""."""
+    # " ".join(text.split()) without a regex: Arrow splits on Unicode
+    # whitespace runs and joins the pieces back in one pass each.
+    lowered = pc.utf8_lower(pa.array(series.astype("string[pyarrow]")))
+    words = pc.utf8_split_whitespace(pc.utf8_trim_whitespace(lowered))
+    joined = pc.binary_join(words, " ")
+    return pd.Series(joined, index=series.index, dtype="string[pyarrow]").fillna("")
 
 
 # -----------------------------------------
 # NUMERIC CLEANERS
 # -----------------------------------------
-def clean_installs(x):
-    if pd.isna(x):
-        return np.nan
-    x = str(x).replace(",", "").replace("+", "")
-    return pd.to_numeric(x, errors="coerce")
-
+def clean_installs(series):
+    """'1,000,000+' → 1000000 for a whole column in one vectorized pass."""
+    cleaned = (
+        series.astype("string[pyarrow]")
+        .str.replace(",", "", regex=False)
+        .str.replace("+", "", regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(cleaned, errors="coerce")
 
-def clean_price(x):
-    if pd.isna(x):
-        return 0.0
-    x = str(x).replace("$", "").replace("MAD", "")
-    return pd.to_numeric(x, errors="coerce")
 
+def clean_price(series):
+    """'$1.99' / '10 MAD' → float, missing prices count as free."""
+    cleaned = series.astype("string[pyarrow]").str.replace(r"[\$]|MAD", "", regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0.0)
 
-def clean_rating(x):
-    return pd.to_numeric(x, errors="coerce")
 
+# -----------------------------------------
+# CSV WRITER
+# -----------------------------------------
+def save_csv(df, path):
+    """Write CSV through Arrow's writer (much faster than DataFrame.to_csv).
 
-def extract_year(date):
-    try:
-        return pd.to_datetime(date).year
-    except:
-        return np.nan
+    Arrow can't put list/dict cells in a CSV, so object columns are written
+    as their Python repr — the same text to_csv would produce.
+    """
+    nested = {
+        col: df[col].map(str, na_action="ignore")
+        for col in df.columns
+        if df[col].dtype == object
+    }
+    table = pa.Table.from_pandas(df.assign(**nested), preserve_index=False)
+    pa.csv.write_csv(table, path)
 
 
 # =========================================
 #           MAIN CLEANING FUNCTION
 # =========================================
-def clean_apps_dataset(path_in, path_out):
+def clean_apps_dataset(path_in, path_out, export=False):
     print(f"📂 Loading: {path_in}")
 
-    df = pd.read_json(path_in)
+    df = pd.read_parquet(path_in, dtype_backend="pyarrow")
 
     print(f"🔢 Loaded {len(df)} rows")
 
@@ -107,13 +149,13 @@ def clean_apps_dataset(path_in, path_out):
     # CLEAN NUMERIC FIELDS
     # -----------------------------------------
     if "installs" in df.columns:
-        df["installs_clean"] = df["installs"].apply(clean_installs)
+        df["installs_clean"] = clean_installs(df["installs"])
 
     if "price" in df.columns:
-        df["price_clean"] = df["price"].apply(clean_price)
+        df["price_clean"] = clean_price(df["price"])
 
     if "score" in df.columns:
-        df["score_clean"] = df["score"].apply(clean_rating)
+        df["score_clean"] = pd.to_numeric(df["score"], errors="coerce")
 
     # -----------------------------------------
     # NORMALIZE TEXT FIELDS
@@ -122,7 +164,7 @@ def clean_apps_dataset(path_in, path_out):
 
     for col in text_columns:
         if col in df.columns:
-            df[col + "_clean"] = df[col].apply(normalize_text)
+            df[col + "_clean"] = normalize_text(df[col])
 
     # -----------------------------------------
     # PARSE LIST-LIKE COLUMNS
@@ -131,13 +173,14 @@ def clean_apps_dataset(path_in, path_out):
 
     for col in list_columns:
         if col in df.columns:
-            df[col] = df[col].apply(safe_eval)
+            df[col] = parse_list_column(df[col])
 
     # -----------------------------------------
     # RELEASE YEAR
     # -----------------------------------------
     if "released" in df.columns:
-        df["release_year"] = df["released"].apply(extract_year)
+        released = pd.to_datetime(df["released"], errors="coerce", utc=True)
+        df["release_year"] = released.dt.year.astype("Int16")
 
     # -----------------------------------------
     # FILL MISSING GENRE
@@ -151,8 +194,13 @@ def clean_apps_dataset(path_in, path_out):
     print("💾 Saving cleaned dataset...")
     Path(path_out).parent.mkdir(parents=True, exist_ok=True)
 
-    df.to_json(path_out, orient="records", indent=2)
-    df.to_csv(path_out.replace(".json", ".csv"), index=False)
+    # Parquet is the pipeline format: columnar, compressed, keeps list dtypes
+    df.to_parquet(path_out, engine="pyarrow", compression="zstd", index=False)
+
+    # Human-readable copies only on request (--export)
+    if export:
+        df.to_json(Path(path_out).with_suffix(".json"), orient="records")
+        save_csv(df, Path(path_out).with_suffix(".csv"))
 
     print("✅ Cleaning completed!")
     print(f"📄 Saved to: {path_out}")
@@ -162,8 +210,14 @@ def clean_apps_dataset(path_in, path_out):
 #               RUN SCRIPT
 # =========================================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the apps dataset")
+    parser.add_argument("--export", action="store_true",
+                        help="also write JSON/CSV copies of the output for inspection")
+    args = parser.parse_args()
+
     clean_apps_dataset(
-        path_in="../../data/processed/apps_clean.json",
-        path_out="../../data/processed/apps_final_cleaned.json"
+        path_in="../../data/processed/apps_clean.parquet",
+        path_out="../../data/processed/apps_final_cleaned.parquet",
+        export=args.export
     )
 
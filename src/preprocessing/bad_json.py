@@ -1,18 +1,35 @@
-import json
+import ijson
+import zstandard
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 raw_dir = Path("../../data/raw")
 
-batch_files = sorted(raw_dir.glob("apps_batch_*.json"))
 
-print(f"Checking {len(batch_files)} batch files...\n")
-
-for file in batch_files:
+def validate_file(file):
+    """Return None if the file is valid JSON, else the parse error message."""
     try:
-        with open(file, "r", encoding="utf-8") as f:
-            json.load(f)
-        print(f"✔ OK     → {file.name}")
+        # Stream the parse events instead of json.load-ing the whole file;
+        # stops at the first bad byte.
+        with open(file, "rb") as raw:
+            f = zstandard.ZstdDecompressor().stream_reader(raw) if file.suffix == ".zst" else raw
+            for _ in ijson.parse(f):
+                pass
+        return None
     except Exception as e:
-        print(f"❌ ERROR  → {file.name}")
-        print(f"   {e}\n")
+        return str(e)
+
+
+if __name__ == "__main__":
+    batch_files = sorted([*raw_dir.glob("apps_batch_*.json"), *raw_dir.glob("apps_batch_*.json.zst")])
+
+    print(f"Checking {len(batch_files)} batch files...\n")
 
+    # One file per worker process; results come back in batch_files order
+    with ProcessPoolExecutor() as executor:
+        for file, error in zip(batch_files, executor.map(validate_file, batch_files)):
+            if error is None:
+                print(f"✔ OK     → {file.name}")
+            else:
+                print(f"❌ ERROR  → {file.name}")
+                print(f"   {error}\n")
@@ -1,8 +1,10 @@
+import argparse
 import pandas as pd
-import numpy as np
-import re
 from pathlib import Path
 
+from apps_cleaner import clean_installs, clean_price, normalize_text, save_csv
+
+
 class DataCleaner:
 
     def __init__(self):
@@ -22,37 +24,21 @@ class DataCleaner:
         merged_path = processed_files[0]
 
         print(f"📥 Loading merged file: {merged_path}")
-        return pd.read_json(merged_path)
-
-    def clean_installs(self, x):
-        if pd.isna(x):
-            return np.nan
-        x = str(x).replace("+", "").replace(",", "").strip()
-        return pd.to_numeric(x, errors="coerce")
-
-    def clean_price(self, x):
-        if pd.isna(x): return 0.0
-        x = str(x).replace("$", "").replace("MAD", "").strip()
-        return pd.to_numeric(x, errors="coerce")
-
-    def clean_rating(self, x):
-        return pd.to_numeric(x, errors="coerce")
-
-    def normalize_text(self, x):
-        if not isinstance(x, str):
-            return ""
-        x = x.lower()
-        x = re.sub(r"\s+", " ", x)
-        x = x.strip()
-        return x
-
-    def extract_year(self, date):
-        try:
-            return pd.to_datetime(date).year
-        except:
-            return np.nan
-
-    def clean(self):
+        return pd.read_json(merged_path, dtype_backend="pyarrow")
+
+    def clean_installs(self, series):
+        """Vectorized '1,000,000+' → 1000000 over the whole column."""
+        return clean_installs(series)
+
+    def clean_price(self, series):
+        """Vectorized '$1.99' / '10 MAD' → float, missing prices count as free."""
+        return clean_price(series)
+
+    def normalize_text(self, series):
+        """Lowercase + collapse whitespace for a whole column; missing → ""."""
+        return normalize_text(series)
+
+    def clean(self, export=False):
         df = self.load_merged()
 
         print("🔧 Cleaning dataset...")
@@ -60,33 +46,47 @@ class DataCleaner:
         # Drop exact duplicates
         df = df.drop_duplicates(subset=["appId"])
 
-        # Clean structured fields
-        df["installs_clean"] = df["installs"].apply(self.clean_installs)
-        df["price_clean"] = df["price"].apply(self.clean_price)
-        df["score_clean"] = df["score"].apply(self.clean_rating)
-
-        # Normalize text fields
-        df["title_clean"] = df["title"].apply(self.normalize_text)
-        df["description_clean"] = df["description"].apply(self.normalize_text)
+        # All derived / filled columns, applied to the frame in one assign
+        columns = {
+            # Clean structured fields
+            "installs_clean": self.clean_installs(df["installs"]),
+            "price_clean": self.clean_price(df["price"]),
+            "score_clean": pd.to_numeric(df["score"], errors="coerce"),
+            # Normalize text fields
+            "title_clean": self.normalize_text(df["title"]),
+            "description_clean": self.normalize_text(df["description"]),
+        }
 
         # Extract year from released date
         if "released" in df.columns:
-            df["release_year"] = df["released"].apply(self.extract_year)
+            released = pd.to_datetime(df["released"], errors="coerce", utc=True)
+            columns["release_year"] = released.dt.year.astype("Int16")
 
         # ✓ Fill missing values
-        df["genre"] = df["genre"].fillna("unknown")
-        df["summary"] = df["summary"].fillna("")
+        columns["genre"] = df["genre"].fillna("unknown")
+        columns["summary"] = df["summary"].fillna("")
+
+        df = df.assign(**columns)
 
         print("📦 Saving processed dataset...")
 
-        df.to_json(self.processed_dir / "apps_clean.json", orient="records", indent=2)
-        df.to_csv(self.processed_dir / "apps_clean.csv", index=False)
+        df.to_parquet(self.processed_dir / "apps_clean.parquet", engine="pyarrow", compression="zstd", index=False)
+
+        # JSON/CSV copies are for eyeballing only
+        if export:
+            df.to_json(self.processed_dir / "apps_clean.json", orient="records")
+            save_csv(df, self.processed_dir / "apps_clean.csv")
 
         print("✅ Data cleaning completed!")
         print(f"📂 Files written to: {self.processed_dir}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the merged apps dataset")
+    parser.add_argument("--export", action="store_true",
+                        help="also write JSON/CSV copies of the output for inspection")
+    args = parser.parse_args()
+
     cleaner = DataCleaner()
-    cleaner.clean()
+    cleaner.clean(export=args.export)
  
@@ -3,7 +3,8 @@ Data Merger and Initial Exploration
 Merges all batch files and prepares data for Hadoop/Spark processing
 """
 
-import json
+import orjson
+import zstandard
 import pandas as pd
 import os
 from pathlib import Path
@@ -18,7 +19,9 @@ class DataMerger:
         
     def merge_all_batches(self):
         """Merge all batch JSON files into one"""
-        batch_files = sorted(self.raw_dir.glob('apps_batch_*.json'))
+        # Plain .json from older runs, zstd-compressed .json.zst from newer ones
+        batch_files = sorted([*self.raw_dir.glob('apps_batch_*.json'),
+                              *self.raw_dir.glob('apps_batch_*.json.zst')])
         
         if not batch_files:
             print("❌ No batch files found!")
@@ -28,9 +31,11 @@ class DataMerger:
         
         all_apps = []
         for batch_file in batch_files:
-            with open(batch_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                all_apps.extend(data)
+            with open(batch_file, 'rb') as f:
+                raw = f.read()
+            if batch_file.suffix == '.zst':
+                raw = zstandard.ZstdDecompressor().decompress(raw)
+            all_apps.extend(orjson.loads(raw))
         
         print(f"✅ Merged {len(all_apps)} apps")
         return all_apps
@@ -63,15 +68,15 @@ class DataMerger:
         """Save cleaned datasets in multiple formats"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Save as JSON (for Hadoop/Spark)
+        # Save as JSON (for Hadoop/Spark) - orjson writes compact UTF-8 bytes directly
         apps_json = self.processed_dir / f'apps_metadata_{timestamp}.json'
         reviews_json = self.processed_dir / f'reviews_metadata_{timestamp}.json'
         
-        with open(apps_json, 'w', encoding='utf-8') as f:
-            json.dump(apps_data, f, ensure_ascii=False, indent=2)
+        with open(apps_json, 'wb') as f:
+            f.write(orjson.dumps(apps_data))
         
-        with open(reviews_json, 'w', encoding='utf-8') as f:
-            json.dump(reviews_data, f, ensure_ascii=False, indent=2)
+        with open(reviews_json, 'wb') as f:
+            f.write(orjson.dumps(reviews_data))
         
         print(f"✅ Saved apps to: {apps_json}")
         print(f"✅ Saved reviews to: {reviews_json}")
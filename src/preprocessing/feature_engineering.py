@@ -3,76 +3,188 @@ Feature Engineering for Play Store Recommendation System
 Generates TF-IDF and BERT embeddings for apps and reviews.
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
+import torch
 from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from sklearn.preprocessing import normalize
 from sentence_transformers import SentenceTransformer
 
 class FeatureEngineer:
-    def __init__(self, apps_path='../../data/processed/apps_clean.json',
-                 reviews_path='../../data/processed/reviews_clean.json',
+    def __init__(self, apps_path='../../data/processed/apps_clean.parquet',
+                 reviews_path='../../data/processed/reviews_clean.parquet',
                  processed_dir='../../data/processed/features'):
         self.apps_path = Path(apps_path)
         self.reviews_path = Path(reviews_path)
         self.processed_dir = Path(processed_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load pre-trained BERT model
-        print("🤖 Loading BERT model...")
-        self.bert_model = SentenceTransformer('all-MiniLM-L6-v2')  # lightweight but strong
+        # Load pre-trained BERT model (GPU in half precision when available)
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        print(f"🤖 Loading BERT model on {self.device}...")
+        self.bert_model_name = 'all-MiniLM-L6-v2'  # lightweight but strong
+        self.bert_model = SentenceTransformer(self.bert_model_name, device=self.device)
+        if self.device == 'cuda':
+            self.bert_model.half()
+
+    def load_data(self, apps_columns=('appId', 'title_clean', 'description_clean'),
+                  reviews_columns=('reviewId', 'appId', 'content_clean')):
+        """Load only the columns the features need (pass None for all of them)."""
+        apps_columns = list(apps_columns) if apps_columns is not None else None
+        reviews_columns = list(reviews_columns) if reviews_columns is not None else None
 
-    def load_data(self):
         print(f"📥 Loading apps from: {self.apps_path}")
-        self.apps_df = pd.read_json(self.apps_path)
+        self.apps_df = pd.read_parquet(self.apps_path, columns=apps_columns, dtype_backend="pyarrow")
         
         print(f"📥 Loading reviews from: {self.reviews_path}")
-        self.reviews_df = pd.read_json(self.reviews_path)
+        self.reviews_df = pd.read_parquet(self.reviews_path, columns=reviews_columns, dtype_backend="pyarrow")
+        self._text_lists = {}
+
+    def text_lists(self, text_column='description_clean'):
+        """(apps texts, review texts) as plain lists, built once and shared by TF-IDF and BERT."""
+        if text_column not in self._text_lists:
+            self._text_lists[text_column] = (
+                self.apps_df[text_column].fillna("").tolist(),
+                self.reviews_df['content_clean'].fillna("").tolist(),
+            )
+        return self._text_lists[text_column]
 
     # ---------------- TF-IDF Features ----------------
-    def compute_tfidf_features(self, text_column='description_clean', max_features=5000):
+    def _hash_texts(self, hasher, texts, chunk_size=10000):
+        """Term counts for texts, tokenized chunk-by-chunk across all cores."""
+        if not texts:
+            # No chunks to stack (and HashingVectorizer can't transform []) - an
+            # empty (0, n_features) matrix keeps the shapes downstream valid
+            return sparse.csr_matrix((0, hasher.n_features), dtype=hasher.dtype)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        n_jobs = -1 if len(chunks) > 1 else 1
+        counts = Parallel(n_jobs=n_jobs)(delayed(hasher.transform)(chunk) for chunk in chunks)
+        return sparse.vstack(counts).tocsr()
+
+    def compute_tfidf_features(self, text_column='description_clean', n_features=2**19):
         print(f"💬 Computing TF-IDF for {text_column}...")
-        vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
-        
+        # Hashing is stateless (no vocabulary), so both corpora share one feature
+        # space and every chunk can be tokenized independently
+        hasher = HashingVectorizer(n_features=n_features, stop_words='english',
+                                   alternate_sign=False, norm=None)
+        apps_text, reviews_text = self.text_lists(text_column)
+        apps_counts = self._hash_texts(hasher, apps_text)
+        reviews_counts = self._hash_texts(hasher, reviews_text)
+
+        # IDF fitted once on apps + reviews together
+        tfidf = TfidfTransformer().fit(sparse.vstack([apps_counts, reviews_counts]))
+
+        def weigh(counts):
+            # sklearn rejects zero-row input; an empty corpus stays an empty matrix
+            return tfidf.transform(counts) if counts.shape[0] else counts
+
         # Apps TF-IDF
-        apps_text = self.apps_df[text_column].fillna("")
-        self.apps_tfidf = vectorizer.fit_transform(apps_text)
+        self.apps_tfidf = weigh(apps_counts)
         print(f"   Apps TF-IDF shape: {self.apps_tfidf.shape}")
         
         # Reviews TF-IDF
-        reviews_text = self.reviews_df['content_clean'].fillna("")
-        self.reviews_tfidf = vectorizer.transform(reviews_text)
+        self.reviews_tfidf = weigh(reviews_counts)
         print(f"   Reviews TF-IDF shape: {self.reviews_tfidf.shape}")
 
-        # Save TF-IDF features (sparse matrix)
-        pd.to_pickle(self.apps_tfidf, self.processed_dir / 'apps_tfidf.pkl')
-        pd.to_pickle(self.reviews_tfidf, self.processed_dir / 'reviews_tfidf.pkl')
+        # Save TF-IDF features (compressed sparse .npz, load with sparse.load_npz)
+        sparse.save_npz(self.processed_dir / 'apps_tfidf.npz', self.apps_tfidf.tocsr(), compressed=True)
+        sparse.save_npz(self.processed_dir / 'reviews_tfidf.npz', self.reviews_tfidf.tocsr(), compressed=True)
         print(f"✅ TF-IDF features saved to {self.processed_dir}")
 
     # ---------------- BERT Embeddings ----------------
-    def compute_bert_embeddings(self, text_column='description_clean', batch_size=64):
+    def _bert_cache_path(self):
+        # One cache per model: vectors from another model are not interchangeable
+        return self.processed_dir / f'bert_cache_{self.bert_model_name}.npz'
+
+    def _load_bert_cache(self):
+        """{blake2b(text) → vector} saved by earlier runs."""
+        path = self._bert_cache_path()
+        if not path.exists():
+            return {}
+        with np.load(path, allow_pickle=False) as cache:
+            keys = cache['keys']
+            # (N, 16) uint8 rows; older caches stored 'S16', which loses trailing NULs
+            keys = [row.tobytes() for row in keys] if keys.dtype == np.uint8 else keys.tolist()
+            return dict(zip(keys, cache['vectors']))
+
+    def _save_bert_cache(self, cache):
+        if not cache:
+            return
+        # Raw digest bytes as uint8 rows - an 'S16' array would strip trailing b'\x00'
+        keys = np.frombuffer(b''.join(cache), dtype=np.uint8).reshape(len(cache), 16)
+        vectors = np.stack(list(cache.values())).astype(np.float16)
+        np.savez(self._bert_cache_path(), keys=keys, vectors=vectors)
+
+    def _encode_unique(self, texts, batch_size, cache):
+        """Encode each distinct text once and scatter the vectors back to row order.
+
+        Texts already in `cache` (keyed by content hash) are not re-encoded, and
+        newly encoded ones are added to it. Empty strings get a zero vector
+        without going through the model.
+        """
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+        embeddings = np.zeros((len(uniques), self.bert_model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        non_empty = np.flatnonzero(uniques != "")
+        keys = [hashlib.blake2b(uniques[i].encode('utf-8'), digest_size=16).digest() for i in non_empty]
+
+        missing = [n for n, key in enumerate(keys) if key not in cache]
+        if missing:
+            encoded = self.bert_model.encode(
+                [uniques[non_empty[n]] for n in missing], batch_size=batch_size, show_progress_bar=True,
+                convert_to_numpy=True, normalize_embeddings=True)
+            for n, vector in zip(missing, encoded):
+                cache[keys[n]] = vector
+
+        if keys:
+            embeddings[non_empty] = np.stack([cache[key] for key in keys])
+
+        print(f"   Encoded {len(missing)} new texts ({len(keys) - len(missing)} cached) for {len(texts)} rows")
+        return embeddings[codes], keys
+
+    def compute_bert_embeddings(self, text_column='description_clean', batch_size=None):
         print(f"🧠 Computing BERT embeddings for {text_column}...")
+        # Bigger batches keep the GPU busy; 64 is plenty on CPU
+        if batch_size is None:
+            batch_size = 256 if self.device == 'cuda' else 64
+        
+        # Vectors from earlier runs - only new / changed texts hit the model
+        cache = self._load_bert_cache()
+        apps_text, reviews_text = self.text_lists(text_column)
         
         # Apps embeddings
-        apps_text = self.apps_df[text_column].fillna("").tolist()
-        self.apps_bert = self.bert_model.encode(apps_text, batch_size=batch_size, show_progress_bar=True, normalize_embeddings=True)
+        self.apps_bert, apps_keys = self._encode_unique(apps_text, batch_size, cache)
         print(f"   Apps BERT shape: {self.apps_bert.shape}")
         
         # Reviews embeddings
-        reviews_text = self.reviews_df['content_clean'].fillna("").tolist()
-        self.reviews_bert = self.bert_model.encode(reviews_text, batch_size=batch_size, show_progress_bar=True, normalize_embeddings=True)
+        self.reviews_bert, reviews_keys = self._encode_unique(reviews_text, batch_size, cache)
         print(f"   Reviews BERT shape: {self.reviews_bert.shape}")
         
-        # Save embeddings
-        np.save(self.processed_dir / 'apps_bert.npy', self.apps_bert)
-        np.save(self.processed_dir / 'reviews_bert.npy', self.reviews_bert)
+        # Keep only what the current corpus uses so the cache doesn't grow forever
+        used = set(apps_keys) | set(reviews_keys)
+        self._save_bert_cache({key: cache[key] for key in used})
+        
+        # Save embeddings (float16 is plenty for unit-norm vectors, half the bytes).
+        # Plain arrays, so downstream can np.load(..., mmap_mode='r') them.
+        np.save(self.processed_dir / 'apps_bert.npy', self.apps_bert.astype(np.float16), allow_pickle=False)
+        np.save(self.processed_dir / 'reviews_bert.npy', self.reviews_bert.astype(np.float16), allow_pickle=False)
         print(f"✅ BERT embeddings saved to {self.processed_dir}")
 
     def run(self):
         self.load_data()
-        self.compute_tfidf_features()
-        self.compute_bert_embeddings()
+        self.text_lists()
+        # TF-IDF (CPU, sparse) and BERT (GPU when there is one) share only the
+        # read-only text lists, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tfidf = executor.submit(self.compute_tfidf_features)
+            bert = executor.submit(self.compute_bert_embeddings)
+            tfidf.result()
+            bert.result()
         print("✨ Feature engineering completed!")
 
 if __name__ == "__main__":
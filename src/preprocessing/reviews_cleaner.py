@@ -1,8 +1,11 @@
+import argparse
 import pandas as pd
 import numpy as np
-import re
 from pathlib import Path
 
+from apps_cleaner import normalize_text, save_csv
+
+
 class ReviewsCleaner:
 
     def __init__(self):
@@ -19,22 +22,17 @@ class ReviewsCleaner:
         
         reviews_path = review_files[0]
         print(f"📥 Loading reviews file: {reviews_path}")
-        return pd.read_json(reviews_path)
+        return pd.read_json(reviews_path, dtype_backend="pyarrow")
 
     def clean_rating(self, x):
         """Ensure review scores are numeric"""
         return pd.to_numeric(x, errors="coerce")
 
-    def normalize_text(self, x):
-        """Lowercase, strip whitespace, remove extra spaces"""
-        if not isinstance(x, str):
-            return ""
-        x = x.lower()
-        x = re.sub(r"\s+", " ", x)
-        x = x.strip()
-        return x
+    def normalize_text(self, series):
+        """Lowercase, strip whitespace, remove extra spaces (whole column at once)"""
+        return normalize_text(series)
 
-    def clean(self):
+    def clean(self, export=False):
         df = self.load_reviews()
         print("🔧 Cleaning reviews dataset...")
 
@@ -47,20 +45,29 @@ class ReviewsCleaner:
 
         # Normalize review text
         if "content" in df.columns:
-            df["content_clean"] = df["content"].apply(self.normalize_text)
+            df["content_clean"] = self.normalize_text(df["content"])
 
         # Fill missing values
         df["userName"] = df.get("userName", pd.Series(["unknown"]*len(df))).fillna("unknown")
         df["appId"] = df.get("appId", pd.Series(["unknown"]*len(df))).fillna("unknown")
 
         # Save processed reviews
-        df.to_json(self.processed_dir / "reviews_clean.json", orient="records", indent=2)
-        df.to_csv(self.processed_dir / "reviews_clean.csv", index=False)
+        df.to_parquet(self.processed_dir / "reviews_clean.parquet", engine="pyarrow", compression="zstd", index=False)
+
+        # JSON/CSV copies are for eyeballing only
+        if export:
+            df.to_json(self.processed_dir / "reviews_clean.json", orient="records")
+            save_csv(df, self.processed_dir / "reviews_clean.csv")
 
         print("✅ Reviews cleaning completed!")
         print(f"📂 Files written to: {self.processed_dir}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the merged reviews dataset")
+    parser.add_argument("--export", action="store_true",
+                        help="also write JSON/CSV copies of the output for inspection")
+    args = parser.parse_args()
+
     cleaner = ReviewsCleaner()
-    cleaner.clean()
+    cleaner.clean(export=args.export)
 
@@ -16,13 +16,10 @@ from datetime import datetime
 # ---------------------------------------------------------
 # Helper: Text Cleaner
 # ---------------------------------------------------------
-def clean_text(text):
-    if pd.isna(text):
-        return None
-    text = str(text).strip()
-    if len(text) == 0:
-        return None
-    return text
+def clean_text(series):
+    """Strip a whole text column; empty or missing values become <NA>."""
+    stripped = series.astype("string[pyarrow]").str.strip()
+    return stripped.mask(stripped.str.len() == 0)
 
 
 # ---------------------------------------------------------
@@ -87,20 +84,20 @@ def clean_reviews(df: pd.DataFrame) -> pd.DataFrame:
     # ------------------------------------
     text_cols = ["userName", "content", "replyContent", "reviewCreatedVersion"]
     for col in text_cols:
-        df[col] = df[col].apply(clean_text)
+        df[col] = clean_text(df[col])
 
     # ------------------------------------
     # Fix types: Rating (score)
     # ------------------------------------
-    df["score"] = pd.to_numeric(df["score"], errors="coerce")
-    df.loc[(df["score"] < 1) | (df["score"] > 5), "score"] = None
+    score = pd.to_numeric(df["score"], errors="coerce").astype(float)
+    df["score"] = score.where(score.between(1, 5))
 
     # ------------------------------------
     # Fix dates
     # ------------------------------------
     date_cols = ["at", "repliedAt"]
     for col in date_cols:
-        df[col] = pd.to_datetime(df[col], errors="coerce")
+        df[col] = pd.to_datetime(df[col], errors="coerce", format="ISO8601", cache=True)
 
     # ------------------------------------
     # Clean thumbsUpCount
@@ -145,7 +142,7 @@ def main():
     out_json = f"{base}_cleaned_{timestamp}.json"
 
     cleaned.to_csv(out_csv, index=False, encoding="utf-8")
-    cleaned.to_json(out_json, orient="records", force_ascii=False, indent=2)
+    cleaned.to_json(out_json, orient="records", force_ascii=False)
 
     print(f"\nSaved cleaned CSV → {out_csv}")
     print(f"Saved cleaned JSON → {out_json}")
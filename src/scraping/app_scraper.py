@@ -5,16 +5,44 @@ Saves data to ../data/raw/
 
 from google_play_scraper import app, search, reviews, Sort
 import pandas as pd
-import json
+import orjson
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 
 class PlayStoreScraper:
-    def __init__(self, output_dir='../data/raw'):
+    def __init__(self, output_dir='../data/raw', max_concurrency=8, requests_per_second=4):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
+        # Politeness: at most max_concurrency calls in flight, and request
+        # starts spaced 1/requests_per_second apart (instead of fixed sleeps)
+        self.max_concurrency = max_concurrency
+        self.request_interval = 1 / requests_per_second
+    
+    def _start_limiter(self):
+        """Create the semaphore/lock/threads for the event loop that is about to run"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._next_request_at = time.monotonic()
+        # to_thread uses the loop's default executor (cpu_count + 4 threads at
+        # most) - give it max_concurrency threads so the semaphore is the limit
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrency))
+    
+    async def _limited(self, func, *args, **kwargs):
+        """Run a blocking scraper call in a worker thread under the rate limit"""
+        async with self._semaphore:
+            async with self._rate_lock:
+                now = time.monotonic()
+                wait = self._next_request_at - now
+                self._next_request_at = max(now, self._next_request_at) + self.request_interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return await asyncio.to_thread(func, *args, **kwargs)
+        
     def scrape_app_details(self, app_id):
         """Scrape detailed information for a single app"""
         try:
@@ -56,66 +84,70 @@ class PlayStoreScraper:
         ['social media', 'games', 'productivity', 'education', 
          'entertainment', 'shopping', 'health fitness', 'photography']
         """
-        all_apps = []
-        app_ids_seen = set()
+        return asyncio.run(self._scrape_category_apps_async(category_queries, apps_per_query))
+    
+    async def _scrape_category_apps_async(self, category_queries, apps_per_query):
+        self._start_limiter()
+        
+        # Run all searches concurrently
+        print(f"\n📱 Searching {len(category_queries)} queries...")
+        search_results = await asyncio.gather(*[
+            self._limited(self.search_apps, query, num_results=apps_per_query)
+            for query in category_queries
+        ])
         
-        for query in category_queries:
-            print(f"\n📱 Searching for: {query}")
-            search_results = self.search_apps(query, num_results=apps_per_query)
-            
-            for idx, search_result in enumerate(search_results):
-                app_id = search_result['appId']
-                
-                # Skip duplicates
-                if app_id in app_ids_seen:
-                    continue
-                
-                app_ids_seen.add(app_id)
-                print(f"  [{idx+1}/{len(search_results)}] Scraping: {search_result['title']}")
-                
-                # Get detailed app info
-                app_details = self.scrape_app_details(app_id)
-                if app_details:
-                    app_details['search_query'] = query
-                    all_apps.append(app_details)
-                
-                # Be polite to the server
-                time.sleep(1)
-            
-            time.sleep(2)  # Longer pause between categories
+        # Skip duplicates - the first query that surfaced an app keeps it
+        app_queries = {}
+        for query, results in zip(category_queries, search_results):
+            print(f"  {query}: {len(results)} results")
+            for search_result in results:
+                app_queries.setdefault(search_result['appId'], query)
+        
+        # Get detailed app info for every unique app concurrently
+        print(f"\n🔎 Scraping details for {len(app_queries)} unique apps...")
+        details = await asyncio.gather(*[
+            self._limited(self.scrape_app_details, app_id) for app_id in app_queries
+        ])
+        
+        all_apps = []
+        for (app_id, query), app_details in zip(app_queries.items(), details):
+            if app_details:
+                app_details['search_query'] = query
+                all_apps.append(app_details)
         
         return all_apps
     
     def scrape_apps_with_reviews(self, app_ids, reviews_per_app=50):
         """Scrape apps and their reviews"""
-        apps_data = []
+        return asyncio.run(self._scrape_apps_with_reviews_async(app_ids, reviews_per_app))
+    
+    async def _scrape_apps_with_reviews_async(self, app_ids, reviews_per_app):
+        self._start_limiter()
+        results = await asyncio.gather(*[
+            self._scrape_app_with_reviews(app_id, reviews_per_app) for app_id in app_ids
+        ])
+        return [result for result in results if result]
+    
+    async def _scrape_app_with_reviews(self, app_id, reviews_per_app):
+        # Get app details
+        app_details = await self._limited(self.scrape_app_details, app_id)
+        if not app_details:
+            return None
         
-        for idx, app_id in enumerate(app_ids):
-            print(f"\n[{idx+1}/{len(app_ids)}] Processing: {app_id}")
-            
-            # Get app details
-            app_details = self.scrape_app_details(app_id)
-            if not app_details:
-                continue
-            
-            # Get reviews
-            print(f"  └─ Fetching reviews...")
-            app_reviews = self.scrape_reviews(app_id, count=reviews_per_app)
-            
-            apps_data.append({
-                'app_details': app_details,
-                'reviews': app_reviews
-            })
-            
-            time.sleep(1.5)
+        # Get reviews
+        app_reviews = await self._limited(self.scrape_reviews, app_id, count=reviews_per_app)
+        print(f"  ✓ {app_id} ({len(app_reviews)} reviews)")
         
-        return apps_data
+        return {
+            'app_details': app_details,
+            'reviews': app_reviews
+        }
     
     def save_to_json(self, data, filename):
         """Save data to JSON file"""
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
         print(f"\n✅ Saved to: {filepath}")
     
     def save_to_csv(self, data, filename):
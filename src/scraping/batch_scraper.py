@@ -3,35 +3,220 @@ Advanced Play Store Batch Scraper with Progress Tracking
 Handles large-scale scraping with checkpoints and error recovery
 """
 
-import json
+import asyncio
+import csv
+import hashlib
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict
-import pandas as pd
+import ijson
+import orjson
+import zstandard
+import httpx
+from urllib.request import Request
 from google_play_scraper import app, search, reviews, Sort
+from google_play_scraper.exceptions import ExtraHTTPError, NotFoundError
+from google_play_scraper.utils import request as gps_request
 from tqdm import tqdm
 
+# Responses worth another try (throttling and transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async rate limiter: `rate` requests/s on average, bursts of up to `burst`"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def penalize(self, seconds):
+        """Hold every acquire() for `seconds` (safe to call from worker threads)"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
 class AdvancedPlayStoreScraper:
-    def __init__(self, output_dir='../data/raw'):
+    def __init__(self, output_dir='../data/raw', max_concurrency=20, requests_per_second=10,
+                 burst=20, retries=3, cache_dir='~/.cache/play_scraper', cache_ttl=7 * 24 * 3600):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Checkpoint file to resume scraping
+        # App details fetched less than cache_ttl seconds ago are served from
+        # disk (cache_dir=None turns the cache off)
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl
+        
+        # Politeness: at most max_concurrency calls in flight, started through
+        # a token bucket; only a 429 from the server makes everyone wait longer
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.retries = retries
+        self._bucket = None
+        
+        # One HTTP/2 client for every call google_play_scraper makes: concurrent
+        # requests are multiplexed over a shared connection instead of each
+        # holding its own. The transport retries failed connects; 429/5xx
+        # retries happen in _urlopen. Idle connections are kept for a minute
+        # (httpx's default is 5 s) so a Retry-After pause doesn't cost a new
+        # DNS lookup + TLS handshake
+        self._client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True, retries=retries,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50,
+                                    keepalive_expiry=60)),
+            timeout=httpx.Timeout(10.0),
+            follow_redirects=True)  # urlopen followed redirects too
+        gps_request._urlopen = self._urlopen
+        
+        # Checkpoint to resume scraping: scraped IDs one per line (appended as
+        # apps finish), everything else (failed IDs) in the JSON file
         self.checkpoint_file = os.path.join(output_dir, 'scraping_checkpoint.json')
+        self.scraped_ids_file = os.path.join(output_dir, 'scraped_ids.txt')
         self.error_log_file = os.path.join(output_dir, 'scraping_errors.log')
         
     def load_checkpoint(self):
-        """Load checkpoint to resume scraping"""
+        """Load checkpoint to resume scraping; scraped_app_ids comes back as a set"""
+        checkpoint = {'scraped_app_ids': [], 'failed_app_ids': []}
         if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
-        return {'scraped_app_ids': [], 'failed_app_ids': []}
+            with open(self.checkpoint_file, 'rb') as f:
+                checkpoint = orjson.loads(f.read())
+        
+        # Older checkpoints kept the scraped IDs as a JSON list
+        scraped_ids = set(checkpoint.get('scraped_app_ids', []))
+        if os.path.exists(self.scraped_ids_file):
+            with open(self.scraped_ids_file, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+            # The last piece is '' after a complete write, or a torn ID
+            # from a run killed mid-append - drop it either way
+            scraped_ids.update(lines[:-1])
+        checkpoint['scraped_app_ids'] = scraped_ids
+        return checkpoint
     
     def save_checkpoint(self, checkpoint):
-        """Save checkpoint"""
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+        """Save checkpoint (full rewrite of both files)"""
+        checkpoint = dict(checkpoint)
+        scraped_ids = checkpoint.pop('scraped_app_ids', ())
+        
+        tmp_file = self.scraped_ids_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(f"{app_id}\n" for app_id in scraped_ids)
+        os.replace(tmp_file, self.scraped_ids_file)
+        
+        tmp_file = self.checkpoint_file + '.tmp'
+        self._write_json(tmp_file, checkpoint)
+        os.replace(tmp_file, self.checkpoint_file)
+    
+    def _append_checkpoint(self, new_ids):
+        """Record newly scraped IDs - write size depends on new_ids only"""
+        if not new_ids:
+            return
+        self._drop_torn_line()
+        with open(self.scraped_ids_file, 'a', encoding='utf-8') as f:
+            f.writelines(f"{app_id}\n" for app_id in new_ids)
+    
+    def _drop_torn_line(self):
+        """Cut a partial last ID (left by a run killed mid-append) back to the last newline
+        
+        Appending after it would glue the next ID onto the fragment.
+        """
+        if not os.path.exists(self.scraped_ids_file):
+            return
+        with open(self.scraped_ids_file, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            # Scan back block by block for the last complete line
+            pos = end
+            while pos > 0:
+                start = max(0, pos - 4096)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b'\n')
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                pos = start
+            f.truncate(0)
+    
+    def _urlopen(self, obj):
+        """Drop-in for google_play_scraper's urlopen wrapper, sent over the shared client"""
+        for attempt in range(self.retries + 1):
+            try:
+                if isinstance(obj, Request):
+                    response = self._client.request(obj.get_method(), obj.full_url,
+                                                    content=obj.data, headers=dict(obj.header_items()))
+                else:
+                    response = self._client.get(obj)
+            except httpx.TransportError:
+                # Timeouts / dropped connections are transient - back off and retry
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                break
+            
+            if response.status_code == 429:
+                # Rate limited: pause the whole bucket for Retry-After, then retry
+                try:
+                    wait = float(response.headers.get('Retry-After', ''))
+                except ValueError:
+                    wait = 2 ** attempt
+                if self._bucket is not None:
+                    self._bucket.penalize(wait)
+            else:
+                wait = 2 ** attempt  # Exponential backoff on server errors
+            time.sleep(wait)
+        
+        # Same exceptions the library raises, so app()'s 404 fallback still works
+        if response.status_code == 404:
+            raise NotFoundError("App not found(404).")
+        if response.status_code >= 400:
+            raise ExtraHTTPError(
+                "App not found. Status code {} returned.".format(response.status_code))
+        return response.content.decode("UTF-8")
+    
+    def _start_limiter(self):
+        """Create the semaphore/bucket/threads for the event loop that is about to run"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = TokenBucket(self.requests_per_second, self.burst)
+        # to_thread runs on the loop's default executor, which is capped at
+        # cpu_count + 4 threads; size it to max_concurrency so the semaphore is
+        # the real limit and a task holding a token never queues for a thread.
+        # asyncio.run shuts it down when the loop ends
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrency))
+    
+    async def _limited(self, func, *args, **kwargs):
+        """Run a blocking scraper call in a worker thread under the rate limit"""
+        async with self._semaphore:
+            await self._bucket.acquire()
+            return await asyncio.to_thread(func, *args, **kwargs)
     
     def log_error(self, message):
         """Log errors to file"""
@@ -39,18 +224,65 @@ class AdvancedPlayStoreScraper:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             f.write(f"[{timestamp}] {message}\n")
     
-    def scrape_app_safely(self, app_id, retries=3):
-        """Scrape app with retry logic"""
-        for attempt in range(retries):
+    def _cache_path(self, app_id):
+        # Two-level fan-out keeps every directory small
+        key = hashlib.sha1(app_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json.zst')
+    
+    def _load_cached_app(self, app_id):
+        """Cached details for app_id, or None if missing, expired or unreadable"""
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(app_id)
+        try:
+            if time.time() - os.path.getmtime(path) >= self.cache_ttl:
+                return None
+            with open(path, 'rb') as f:
+                return orjson.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+        except (OSError, orjson.JSONDecodeError, zstandard.ZstdError):
+            return None
+    
+    def _save_cached_app(self, app_id, result):
+        """Best effort: a cache that can't be written only costs a refetch later"""
+        if not self.cache_dir:
+            return
+        path = self._cache_path(app_id)
+        # Write-then-rename so a concurrent reader never sees half a file
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                                   default=str)
+            with open(tmp_path, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=3).compress(payload))
+            os.replace(tmp_path, path)
+        except (OSError, orjson.JSONEncodeError) as e:
+            self.log_error(f"Could not cache {app_id}: {str(e)}")
             try:
-                result = app(app_id, lang='en', country='us')
-                return result
-            except Exception as e:
-                if attempt == retries - 1:
-                    self.log_error(f"Failed to scrape {app_id}: {str(e)}")
-                    return None
-                time.sleep(2 ** attempt)  # Exponential backoff
-        return None
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def scrape_app_safely(self, app_id):
+        """Scrape app details, served from the disk cache when fresh"""
+        cached = self._load_cached_app(app_id)
+        if cached is not None:
+            return cached
+        return self._fetch_app(app_id)
+    
+    def _fetch_app(self, app_id):
+        """App details from the store (transient errors are already retried in _urlopen)"""
+        try:
+            result = app(app_id, lang='en', country='us')
+        except NotFoundError as e:
+            # Dead/removed app: a 404 is final, so it is never retried
+            self.log_error(f"App not found {app_id}: {str(e)}")
+            return None
+        except Exception as e:
+            self.log_error(f"Failed to scrape {app_id}: {str(e)}")
+            return None
+        self._save_cached_app(app_id, result)
+        return result
     
     def scrape_reviews_safely(self, app_id, count=100, sort=Sort.MOST_RELEVANT):
         """Scrape reviews with error handling"""
@@ -68,18 +300,29 @@ class AdvancedPlayStoreScraper:
         Discover apps across multiple categories
         Returns list of unique app IDs
         """
-        all_app_ids = set()
-        
         print("🔍 Discovering apps...")
-        for category in tqdm(categories, desc="Categories"):
-            try:
-                results = search(category, lang='en', country='us', 
-                               n_hits=apps_per_category)
-                for result in results:
-                    all_app_ids.add(result['appId'])
-                time.sleep(1)
-            except Exception as e:
-                self.log_error(f"Search failed for '{category}': {str(e)}")
+        return asyncio.run(self._discover_apps_async(categories, apps_per_category))
+    
+    def _search_safely(self, category, n_hits):
+        """Search one category; returns the set of app IDs found"""
+        try:
+            results = search(category, lang='en', country='us', n_hits=n_hits)
+            return {result['appId'] for result in results}
+        except Exception as e:
+            self.log_error(f"Search failed for '{category}': {str(e)}")
+            return set()
+    
+    async def _discover_apps_async(self, categories, apps_per_category):
+        self._start_limiter()
+        tasks = [
+            self._limited(self._search_safely, category, apps_per_category)
+            for category in categories
+        ]
+        
+        # Searches are independent - run them all, pacing comes from the limiter
+        all_app_ids = set()
+        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Categories"):
+            all_app_ids |= await task
         
         return list(all_app_ids)
     
@@ -90,8 +333,7 @@ class AdvancedPlayStoreScraper:
         """
         Scrape apps in batches with checkpoint system
         """
-        checkpoint = self.load_checkpoint()
-        scraped_ids = set(checkpoint['scraped_app_ids'])
+        scraped_ids = self.load_checkpoint()['scraped_app_ids']
         
         # Filter out already scraped apps
         remaining_ids = [aid for aid in app_ids if aid not in scraped_ids]
@@ -103,38 +345,65 @@ class AdvancedPlayStoreScraper:
         print(f"📊 Total apps to scrape: {len(remaining_ids)}")
         print(f"✅ Already scraped: {len(scraped_ids)}")
         
+        return asyncio.run(self._batch_scrape_apps_async(
+            remaining_ids, scraped_ids,
+            include_reviews, reviews_per_app, save_interval))
+    
+    async def _scrape_app_with_reviews(self, app_id, include_reviews, reviews_per_app):
+        """Details and reviews for one app, both requests in flight at once"""
+        if not include_reviews:
+            return app_id, await self._app_details(app_id)
+        
+        app_data, app_reviews = await asyncio.gather(
+            self._app_details(app_id),
+            self._limited(self.scrape_reviews_safely, app_id, count=reviews_per_app),
+        )
+        if app_data:
+            app_data['scraped_reviews'] = app_reviews
+        return app_id, app_data
+    
+    async def _app_details(self, app_id):
+        # Cache hits don't touch the network, so they skip the rate limiter too
+        cached = self._load_cached_app(app_id)
+        if cached is not None:
+            return cached
+        return await self._limited(self._fetch_app, app_id)
+    
+    async def _batch_scrape_apps_async(self, remaining_ids, scraped_ids,
+                                       include_reviews, reviews_per_app, save_interval):
+        self._start_limiter()
+        tasks = [
+            self._scrape_app_with_reviews(app_id, include_reviews, reviews_per_app)
+            for app_id in remaining_ids
+        ]
+        
         scraped_data = []
+        new_ids = []  # scraped since the last checkpoint append
         
-        for idx, app_id in enumerate(tqdm(remaining_ids, desc="Scraping apps")):
-            # Scrape app details
-            app_data = self.scrape_app_safely(app_id)
+        # Results arrive in completion order; the event loop is single-threaded,
+        # so the batch/checkpoint bookkeeping below needs no locking
+        for idx, task in enumerate(tqdm(asyncio.as_completed(tasks), total=len(tasks),
+                                        desc="Scraping apps")):
+            app_id, app_data = await task
             
             if app_data:
-                # Add reviews if requested
-                if include_reviews:
-                    app_reviews = self.scrape_reviews_safely(app_id, 
-                                                            count=reviews_per_app)
-                    app_data['scraped_reviews'] = app_reviews
-                
                 scraped_data.append(app_data)
                 scraped_ids.add(app_id)
+                new_ids.append(app_id)
                 
                 # Save progress periodically
                 if (idx + 1) % save_interval == 0:
                     self._save_batch(scraped_data)
-                    checkpoint['scraped_app_ids'] = list(scraped_ids)
-                    self.save_checkpoint(checkpoint)
+                    self._append_checkpoint(new_ids)
                     scraped_data = []  # Clear memory
-            
-            time.sleep(1.2)  # Rate limiting
+                    new_ids = []
         
         # Save remaining data
         if scraped_data:
             self._save_batch(scraped_data)
         
         # Final checkpoint
-        checkpoint['scraped_app_ids'] = list(scraped_ids)
-        self.save_checkpoint(checkpoint)
+        self._append_checkpoint(new_ids)
         
         print(f"\n✨ Scraping complete! Total apps: {len(scraped_ids)}")
     
@@ -143,62 +412,156 @@ class AdvancedPlayStoreScraper:
         if not data:
             return
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'apps_batch_{timestamp}.json'
+        # Microseconds too: concurrent scraping can fill several batches a second
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        filename = f'apps_batch_{timestamp}.json.zst'
         filepath = os.path.join(self.output_dir, filename)
         
-        # Convert data to JSON-serializable format
-        serializable_data = self._make_serializable(data)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_data, f, ensure_ascii=False, indent=2)
+        # Minified + zstd: batch files are only ever read back by merge_batches
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                               default=str)
+        with open(filepath, 'wb') as f:
+            f.write(zstandard.ZstdCompressor(level=3).compress(payload))
     
-    def _make_serializable(self, obj):
-        """Convert objects to JSON-serializable format"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {key: self._make_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        else:
-            return obj
+    def _write_json(self, filepath, data):
+        """Write data as compact UTF-8 JSON in one pass (orjson handles datetimes itself)"""
+        # No indentation - read it with `python -m json.tool <file>` if needed
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(
+                data,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                default=str))
     
     def merge_batches(self, output_filename='apps_merged.json'):
         """Merge all batch files into one"""
-        batch_files = [f for f in os.listdir(self.output_dir) 
-                      if f.startswith('apps_batch_')]
+        # scandir yields entries lazily with their file type from the same
+        # syscall; only matching names are kept (JSON and CSV passes reuse them)
+        with os.scandir(self.output_dir) as entries:
+            batch_files = sorted(
+                entry.name for entry in entries
+                if entry.name.startswith('apps_batch_')
+                and entry.name.endswith(('.json', '.json.zst'))
+                and entry.is_file())
         
         if not batch_files:
             print("No batch files found!")
             return
         
-        all_data = []
-        for batch_file in tqdm(batch_files, desc="Merging batches"):
-            filepath = os.path.join(self.output_dir, batch_file)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                all_data.extend(data)
-        
-        # Save merged file
+        # Save merged file - apps are streamed from the batches straight into
+        # the output, so memory stays flat however large the corpus gets. It is
+        # written to a .tmp file first: a bad batch must not leave a half
+        # merge in place of the previous good one
         output_path = os.path.join(self.output_dir, output_filename)
-        serializable_data = self._make_serializable(all_data)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_data, f, ensure_ascii=False, indent=2)
+        tmp_path = output_path + '.tmp'
+        total = 0
+        try:
+            with open(tmp_path, 'wb') as out:
+                out.write(b'[')
+                for item in self._iter_batch_items(batch_files, desc="Merging batches"):
+                    out.write(b',\n' if total else b'\n')
+                    out.write(orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS))
+                    total += 1
+                out.write(b'\n]')
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            self._remove_quietly(tmp_path)
+            raise
         
-        print(f"\n✅ Merged {len(all_data)} apps into {output_filename}")
+        print(f"\n✅ Merged {total} apps into {output_filename}")
         
         # Convert to CSV - handle nested structures carefully
         try:
-            df = pd.json_normalize(all_data, max_level=1)
             csv_path = output_path.replace('.json', '.csv')
-            df.to_csv(csv_path, index=False, encoding='utf-8')
+            self._write_csv(csv_path, batch_files)
             print(f"✅ Also saved as CSV: {csv_path}")
         except Exception as e:
             print(f"⚠️  CSV conversion warning: {str(e)}")
             print("   JSON file is still available")
     
+    def _write_csv(self, csv_path, batch_files):
+        """Stream batch apps into a CSV row by row; nested values go out as JSON"""
+        # First pass only collects the column names (first-seen order)
+        fieldnames = {}
+        for item in self._iter_batch_items(batch_files):
+            fieldnames.update(dict.fromkeys(item))
+        
+        tmp_path = csv_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(fieldnames))
+                writer.writeheader()
+                for item in self._iter_batch_items(batch_files):
+                    writer.writerow({
+                        key: orjson.dumps(value).decode() if isinstance(value, (dict, list)) else value
+                        for key, value in item.items()
+                    })
+            os.replace(tmp_path, csv_path)
+        except BaseException:
+            self._remove_quietly(tmp_path)
+            raise
+    
+    @staticmethod
+    def _remove_quietly(path):
+        """Delete a leftover tmp file; nothing to do if it is already gone"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def _iter_batch_items(self, batch_files, desc=None):
+        """Yield apps one at a time from batch files, never a whole batch in memory
+        
+        Files are read and parsed by a thread pool, each into its own bounded
+        queue; the queues are drained in batch_files order, so the output is
+        the same on every run whatever the thread scheduling.
+        """
+        stop = threading.Event()
+        file_done = object()
+        
+        def parse_batch(batch_file, items):
+            try:
+                if stop.is_set():
+                    return
+                filepath = os.path.join(self.output_dir, batch_file)
+                with open(filepath, 'rb') as raw:
+                    # Older batches are plain .json, newer ones .json.zst
+                    f = (zstandard.ZstdDecompressor().stream_reader(raw)
+                         if batch_file.endswith('.zst') else raw)
+                    # ijson builds one app at a time, so a batch is never held whole
+                    for item in ijson.items(f, 'item', use_float=True):
+                        if stop.is_set():
+                            return
+                        items.put(item)
+            finally:
+                items.put(file_done)
+        
+        queues = [queue.Queue(maxsize=256) for _ in batch_files]
+        progress = tqdm(total=len(batch_files), desc=desc, disable=desc is None)
+        # The pool starts files in submission order, so the file being drained
+        # is always running or finished - never waiting behind blocked workers
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(parse_batch, batch_file, items)
+                       for batch_file, items in zip(batch_files, queues)]
+            drained = 0  # queues whose file_done has been taken
+            try:
+                for items in queues:
+                    item = items.get()
+                    while item is not file_done:
+                        yield item
+                        item = items.get()
+                    drained += 1
+                    progress.update(1)
+                    # Surface a parse error as soon as its file is reached
+                    futures[drained - 1].result()
+            finally:
+                # Consumer gave up early (or a file failed): unblock the
+                # workers still filling their queues before joining them
+                stop.set()
+                for items in queues[drained:]:
+                    while items.get() is not file_done:
+                        pass
+                progress.close()
+    
     def get_statistics(self):
         """Get scraping statistics"""
         checkpoint = self.load_checkpoint()
@@ -1,8 +1,96 @@
 import json
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
 
+# Line-delimited files are summarized chunk by chunk instead of loaded whole
+NDJSON_SUFFIXES = {".jsonl", ".ndjson"}
+CHUNK_SIZE = 10000
+
+
+def load_json(json_path):
+    """Load a JSON file of records straight into a DataFrame."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        first_char = f.read(1024).lstrip()[:1]
+
+    if first_char != "{":
+        return pd.read_json(json_path, orient="records", convert_dates=False, dtype=False)
+
+    # Maybe nested like {"apps": [...]} → use the first list inside
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for key in data:
+        if isinstance(data[key], list):
+            data = data[key]
+            break
+    return pd.DataFrame(data)
+
+
+def numeric_summary(df):
+    """Numeric columns that actually hold values (all-null columns are skipped)."""
+    numeric = [col for col in df.columns
+               if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+    numeric = df[numeric]
+    return numeric.loc[:, numeric.notna().any()]
+
+
+def describe_numeric(df):
+    """Same table as DataFrame.describe(), computed on plain float arrays with numpy."""
+    stats = {}
+    for col in df.columns:
+        arr = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        arr = arr[~np.isnan(arr)]
+        q25, q50, q75 = np.percentile(arr, [25, 50, 75])
+        stats[col] = [arr.size, arr.mean(), arr.std(ddof=1) if arr.size > 1 else np.nan,
+                      arr.min(), q25, q50, q75, arr.max()]
+    return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+
+def merge_moments(a, b):
+    """Combine (count, mean, M2, min, max) of two chunks (Chan et al. parallel variance)."""
+    n_a, mean_a, m2_a, min_a, max_a = a
+    n_b, mean_b, m2_b, min_b, max_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return n, mean, m2, min(min_a, min_b), max(max_a, max_b)
+
+
+def summarize_ndjson(json_path):
+    """Record count, columns, preview and numeric stats, one chunk in memory at a time."""
+    n_records = 0
+    columns = {}
+    preview = None
+    moments = {}  # column → (count, mean, M2, min, max) over the chunks seen so far
+
+    for chunk in pd.read_json(json_path, lines=True, chunksize=CHUNK_SIZE,
+                              convert_dates=False, dtype=False):
+        if preview is None:
+            preview = chunk.head()
+        n_records += len(chunk)
+        columns.update(dict.fromkeys(chunk.columns))
+        numeric = numeric_summary(chunk)
+        for col in numeric.columns:
+            # float64 up front: squaring large int64 counts would overflow
+            arr = numeric[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            arr = arr[~np.isnan(arr)]
+            mean = arr.mean()
+            chunk_moments = (arr.size, mean, ((arr - mean) ** 2).sum(), arr.min(), arr.max())
+            moments[col] = merge_moments(moments[col], chunk_moments) if col in moments else chunk_moments
+
+    if not moments:
+        return n_records, list(columns), preview, None
+
+    summary = {}
+    for col, (count, mean, m2, col_min, col_max) in moments.items():
+        std = (m2 / (count - 1)) ** 0.5 if count > 1 else np.nan
+        summary[col] = [count, mean, std, col_min, col_max]
+    summary = pd.DataFrame(summary, index=['count', 'mean', 'std', 'min', 'max'])
+    return n_records, list(columns), preview, summary
+
+
 def visualize_json(json_path):
     json_path = Path(json_path)
 
@@ -14,36 +102,29 @@ def visualize_json(json_path):
 
     # Read JSON
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if json_path.suffix in NDJSON_SUFFIXES:
+            n_records, columns, preview, summary = summarize_ndjson(json_path)
+        else:
+            df = load_json(json_path)
+            n_records, columns, preview = len(df), list(df.columns), df.head()
+            numeric = numeric_summary(df)
+            summary = describe_numeric(numeric) if len(numeric.columns) > 0 else None
     except Exception as e:
         print(f"❌ Failed to load JSON: {e}")
         return
 
-    # If it's not a list of objects → convert
-    if isinstance(data, dict):
-        # maybe nested like {"apps": [...]}
-        for key in data:
-            if isinstance(data[key], list):
-                data = data[key]
-                break
-
-    # Convert to DataFrame for easy visualization
-    df = pd.DataFrame(data)
-
     print("📌 Dataset Summary")
     print("------------------")
-    print(f"🔢 Number of records: {len(df)}")
-    print(f"🔑 Columns: {list(df.columns)}\n")
+    print(f"🔢 Number of records: {n_records}")
+    print(f"🔑 Columns: {columns}\n")
 
     print("📄 Preview (first 5 rows):")
-    print(df.head(), "\n")
+    print(preview, "\n")
 
     # Show numeric statistics if exist
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    if len(numeric_cols) > 0:
+    if summary is not None and len(summary.columns) > 0:
         print("📊 Numeric Summary:")
-        print(df[numeric_cols].describe())
+        print(summary)
     else:
         print("ℹ️ No numeric fields to summarize.")
 
@@ -54,4 +135,3 @@ if __name__ == "__main__":
         sys.exit(1)
 
     visualize_json(sys.argv[1])
-